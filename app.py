@@ -2,32 +2,67 @@
 # This is the Python Flask backend server that will handle requests from the browser
 # and execute the local terminal commands.
 
+import errno
+import fnmatch
+import functools
+import hashlib
+import json
 import subprocess
+import sys
 import os
+import re
 import logging
-import platform
 import shutil
+import tempfile
+import threading
+import time
+import types
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from glob import glob
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request
 from flask_cors import CORS # Required for cross-origin requests if you run frontend from different origin
 
+try:
+    import orjson  # Optional: much faster JSON serialization
+except ImportError:
+    orjson = None
+
+# Checked by every endpoint, so evaluate it once
+_IS_WINDOWS = sys.platform == 'win32'
+
 # Platform-specific imports for window management
-if platform.system() == 'Windows':
+if _IS_WINDOWS:
     import win32gui
     import win32con
-    import win32api
-
-# Set up logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+    import win32file
+
+# Set up logging. INFO by default; set AO_LOG_LEVEL=DEBUG for per-launch command details.
+_LOG_LEVEL = getattr(logging, os.environ.get('AO_LOG_LEVEL', 'INFO').upper(), logging.INFO)
+if not isinstance(_LOG_LEVEL, int):
+    # Names such as BASIC_FORMAT are logging attributes too, but not levels
+    _LOG_LEVEL = logging.INFO
+logging.basicConfig(level=_LOG_LEVEL, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-# Enable CORS for development. In a production scenario, you might want to restrict this.
-CORS(app)
+# The bundled pages are served by this app, so their API calls are same-origin. CORS is only
+# enabled for the API routes and only for a frontend running locally on the default port;
+# max_age lets browsers cache the preflight response instead of repeating it per request.
+# Flask-CORS matches the pattern from the start of the path only, so it is anchored at the
+# end to keep the whitelist to exactly these routes.
+CORS_ORIGINS = ["http://localhost:5000", "http://127.0.0.1:5000"]
+CORS(
+    app,
+    resources={
+        r"/(launch|check_and_focus_window|focus_launcher_window|close_running_instances"
+        r"|copy_preferences|copy_preferences_stream|delete_shortcutbar_settings)$": {"origins": CORS_ORIGINS}
+    },
+    max_age=86400
+)
 
-PREFERENCE_ITEMS = {
+_PREFERENCE_ITEM_DEFS = {
     "charCfg": {"label": "Char.cfg", "path": "Char.cfg", "type": "file"},
     "prefsXml": {"label": "Prefs.xml", "path": "Prefs.xml", "type": "file"},
     "chatFolder": {"label": "Chat folder", "path": "Chat", "type": "folder"},
@@ -60,6 +95,151 @@ PREFERENCE_ITEMS = {
     "textMacroBin": {"label": "TextMacro.bin", "path": "TextMacro.bin", "type": "file"}
 }
 
+# Frozen per-item records, built once; the copy helpers read them by attribute
+PrefItem = namedtuple('PrefItem', 'id label path type')
+PREFERENCE_ITEMS = {
+    item_id: PrefItem(item_id, item_def["label"], item_def["path"], item_def["type"])
+    for item_id, item_def in _PREFERENCE_ITEM_DEFS.items()
+}
+
+# Glob items only wildcard the file name. Their patterns are compiled once; the matchers take
+# os.path.normcase()d names, which gives fnmatch.fnmatch's semantics (case-insensitive on Windows)
+_GLOB_NAME_MATCHERS = {
+    item.id: re.compile(fnmatch.translate(os.path.normcase(os.path.basename(item.path)))).match
+    for item in PREFERENCE_ITEMS.values()
+    if item.type == "glob"
+}
+
+# Game client windows are titled "Anarchy Online - <character name>"
+_AO_PREFIX = "Anarchy Online - "
+_AO_PREFIX_LEN = len(_AO_PREFIX)
+_LAUNCHER_WINDOW_TITLE = "Knows Modded AO#"
+
+# How long to give freshly started launchers to fail before reporting them as launched
+LAUNCH_FAILURE_PROBE_SECONDS = 0.5
+
+# Shortcutbar layouts are Containers/ShortcutBar*.xml; resolved once for the delete endpoint
+_SHORTCUTBAR_SUBDIR = os.path.dirname(PREFERENCE_ITEMS["containersShortcutBars"].path)
+_SHORTCUTBAR_MATCH = _GLOB_NAME_MATCHERS["containersShortcutBars"]
+# Shared tail of the per-target result for characters without any shortcutbar files
+_NO_SHORTCUTBARS_RESULT = types.MappingProxyType({"status": "success", "message": "No shortcutbar files found"})
+
+# robocopy ships with Windows; used to mirror preference folders
+_ROBOCOPY = shutil.which("robocopy") if _IS_WINDOWS else None
+
+# Snapshot of game client windows shared by the window management endpoints.
+# The frontend calls check -> launch -> focus in quick succession, so a short TTL
+# lets those requests reuse a single EnumWindows pass.
+_WINDOW_CACHE_TTL = 0.25
+_window_cache = {"ts": 0.0, "data": []}
+_window_cache_lock = threading.Lock()
+
+# Rendered HTML and its ETag per template name, filled on first request (see _render_page)
+_page_cache = {}
+
+
+def _collect_ao_windows(hwnd, windows):
+    """EnumWindows callback appending (hwnd, name, lower-cased name) for game client windows."""
+    if not win32gui.IsWindowVisible(hwnd):
+        return True
+    # Probe the title length first: it copies nothing, and a title that cannot hold
+    # the prefix plus a name is rejected without fetching the text at all
+    if win32gui.GetWindowTextLength(hwnd) <= _AO_PREFIX_LEN:
+        return True
+    window_text = win32gui.GetWindowText(hwnd)
+    # Cheap first-character test rejects almost every other window before startswith
+    if window_text[:1] == "A" and window_text.startswith(_AO_PREFIX) \
+            and len(window_text) > _AO_PREFIX_LEN:
+        char_name = window_text[_AO_PREFIX_LEN:]
+        windows.append((hwnd, char_name, char_name.lower()))
+    return True
+
+
+def _get_visible_windows():
+    """Return (hwnd, character_name, lower-cased character_name) for visible game client windows."""
+    with _window_cache_lock:
+        now = time.monotonic()
+        if now - _window_cache["ts"] < _WINDOW_CACHE_TTL:
+            return _window_cache["data"]
+
+        windows = []
+        win32gui.EnumWindows(_collect_ao_windows, windows)
+        _window_cache["data"] = windows
+        _window_cache["ts"] = now
+        return windows
+
+
+def _find_visible_window(window_title: str) -> int:
+    """Return the first visible top-level window with exactly this title, or 0.
+
+    FindWindowEx matches the title natively, so no Python callback runs per window.
+    """
+    hwnd = 0
+    while True:
+        try:
+            hwnd = win32gui.FindWindowEx(0, hwnd, None, window_title)
+        except win32gui.error:
+            return 0
+        if not hwnd or win32gui.IsWindowVisible(hwnd):
+            return hwnd
+
+
+def _invalidate_window_cache():
+    """Force the next window lookup to re-enumerate (the window set has changed)."""
+    with _window_cache_lock:
+        _window_cache["ts"] = 0.0
+
+
+def _dumps_json(payload) -> bytes:
+    """Serialize ``payload`` to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _json_response(payload, status: int = 200):
+    """Serialize ``payload`` to a JSON response."""
+    return app.response_class(_dumps_json(payload), status=status, mimetype='application/json')
+
+
+# Bodies of the "unsupported platform" replies are fixed, so they are serialized once
+_UNSUPPORTED_BODIES = {
+    feature: _dumps_json({"status": "unsupported", "message": message, **extra})
+    for feature, message, extra in (
+        ("window_check", "Window checking is only supported on Windows", {"conflicts": []}),
+        ("window_focus", "Window focusing is only supported on Windows", {}),
+        ("window_close", "Window management is only supported on Windows", {}),
+        ("prefs_copy", "Character preference copying is only supported on Windows", {}),
+        ("shortcutbar_delete", "Shortcutbar deletion is only supported on Windows", {}),
+    )
+}
+
+
+def _unsupported_response(feature: str):
+    """Return the prebuilt "unsupported platform" JSON response for ``feature``."""
+    return app.response_class(_UNSUPPORTED_BODIES[feature], status=200, mimetype='application/json')
+
+
+def _request_json():
+    """Parse the request body as JSON, using orjson when it is installed. Returns None if it is not valid JSON."""
+    if orjson is None:
+        return request.get_json(silent=True, cache=False)
+    body = request.get_data(cache=False)
+    if not body:
+        return None
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _selected_account_set(data: dict):
+    """Return the request's selectedAccounts as a frozenset, or None unless it is a list of names."""
+    selected = data.get('selectedAccounts', [])
+    if not isinstance(selected, list) or not all(isinstance(name, str) for name in selected):
+        return None
+    return frozenset(selected)
+
 
 def _ensure_char_folder_name(character_id: str) -> str:
     """Return the directory name for a character ID (ensure it is prefixed with 'Char')."""
@@ -77,105 +257,662 @@ def _get_character_prefs_path(base_path: str, account_name: str, character_id: s
     return os.path.join(base_path, account_name, folder_name)
 
 
-def _backup_preference_item(target_dir: str, backup_root: str, item_def: dict) -> bool:
-    """Create a backup copy of the requested item if it exists in the target directory."""
+class _CharTrie:
+    """Prefix tree over lower-cased character names.
+
+    Used as a fallback when a window title carries decoration after the character name
+    (e.g. "Anarchy Online - Name [AFK]") and the exact dictionary lookup misses.
+    """
+
+    __slots__ = ('children', 'account')
+
+    def __init__(self):
+        self.children = {}
+        self.account = None
+
+    @classmethod
+    def from_mapping(cls, char_to_account: dict) -> "_CharTrie":
+        root = cls()
+        for char_name, acc_name in char_to_account.items():
+            root.insert(char_name, acc_name)
+        return root
+
+    def insert(self, char_name: str, acc_name: str):
+        node = self
+        for ch in char_name:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _CharTrie()
+            node = child
+        node.account = acc_name
+
+    def longest_prefix_account(self, title: str):
+        """Return the account of the longest character name that prefixes ``title``.
+
+        A match only counts when it ends at a word boundary, so "bob" does not claim "bobby".
+        """
+        best = None
+        node = self
+        for index, ch in enumerate(title):
+            node = node.children.get(ch)
+            if node is None:
+                break
+            if node.account is not None:
+                next_index = index + 1
+                if next_index == len(title) or not title[next_index].isalnum():
+                    best = node.account
+        return best
+
+
+def _lookup_account(key: str, char_to_account: dict, char_trie: _CharTrie):
+    """Resolve a lower-cased character name to its account (exact match first, then prefix)."""
+    acc_name = char_to_account.get(key)
+    if acc_name is None:
+        acc_name = char_trie.longest_prefix_account(key)
+    return acc_name
+
+
+def _build_char_to_account(accounts_key: tuple) -> dict:
+    """Map lower-cased character names to their account name in a single pass."""
+    char_to_account = {}
+    for acc_name, char_names in accounts_key:
+        if not acc_name:
+            continue
+        for char_name in char_names:
+            if char_name:
+                char_to_account[char_name.lower()] = acc_name
+    return char_to_account
+
+
+def _fast_copy(source_path: str, dest_path: str):
+    """Copy a single file including its timestamps.
+
+    On Windows this calls CopyFileW directly, letting the kernel copy the data (and clone it
+    on filesystems that support it) instead of streaming it through Python buffers.
+    """
+    if _IS_WINDOWS:
+        try:
+            win32file.CopyFile(source_path, dest_path, False)
+        except win32file.error as e:
+            # Re-raise as OSError; given a winerror, Python picks the matching subclass
+            # (FileNotFoundError, PermissionError, ...) so callers can handle it portably
+            raise OSError(None, e.strerror, source_path, e.winerror) from e
+    else:
+        shutil.copy2(source_path, dest_path)
+
+
+def _copy_file_if_present(source_path: str, dest_path: str, created_dirs: set) -> bool:
+    """Copy a file, returning False instead of raising if the source does not exist.
+
+    The copy is attempted first; only when it fails with FileNotFoundError is the source
+    checked, and if it is there the destination folder is created and the copy retried.
+    """
+    try:
+        _fast_copy(source_path, dest_path)
+        return True
+    except FileNotFoundError:
+        if not os.path.isfile(source_path):
+            return False
+    _ensure_dir(os.path.dirname(dest_path), created_dirs)
+    _fast_copy(source_path, dest_path)
+    return True
+
+
+def _ensure_dir(path: str, created_dirs: set):
+    """os.makedirs(path, exist_ok=True), skipped when path was already ensured in created_dirs."""
+    if path in created_dirs:
+        return
+    os.makedirs(path, exist_ok=True)
+    created_dirs.add(path)
+
+
+def _mirror_tree(source_dir: str, dest_dir: str):
+    """Make dest_dir an exact copy of source_dir, replacing whatever was there before."""
+    if _ROBOCOPY:
+        # robocopy copies many small files far faster than shutil.copytree on Windows
+        result = subprocess.run(
+            [_ROBOCOPY, source_dir, dest_dir, "/MIR", "/MT:8", "/NFL", "/NDL", "/NJH", "/NJS", "/NP", "/R:1", "/W:1"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        )
+        # Exit codes below 8 are success flags (files copied, extra files removed, ...)
+        if result.returncode >= 8:
+            raise OSError(f"robocopy failed with exit code {result.returncode} copying {source_dir}")
+        return
+
+    if os.path.isdir(dest_dir):
+        shutil.rmtree(dest_dir)
+    shutil.copytree(source_dir, dest_dir, copy_function=_fast_copy)
+
+
+def _backup_preference_item(target_dir: str, backup_root: str, item_def: PrefItem, created_dirs: set) -> bool:
+    """Create a backup copy of the requested item if it exists in the target directory.
+
+    The target is only ever copied from, never moved: if the copy that follows fails, the
+    character keeps its current preferences.
+    """
     if not backup_root:
         return False
 
-    os.makedirs(backup_root, exist_ok=True)
+    _ensure_dir(backup_root, created_dirs)
 
-    if item_def["type"] == "file":
-        source_path = os.path.join(target_dir, item_def["path"])
-        if os.path.isfile(source_path):
-            backup_path = os.path.join(backup_root, item_def["path"])
-            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-            shutil.copy2(source_path, backup_path)
-            return True
-        return False
+    if item_def.type == "file":
+        return _copy_file_if_present(
+            os.path.join(target_dir, item_def.path), os.path.join(backup_root, item_def.path), created_dirs
+        )
 
-    if item_def["type"] == "folder":
-        source_dir = os.path.join(target_dir, item_def["path"])
+    if item_def.type == "folder":
+        source_dir = os.path.join(target_dir, item_def.path)
         if os.path.isdir(source_dir):
-            backup_dir = os.path.join(backup_root, item_def["path"])
-            if os.path.isdir(backup_dir):
-                shutil.rmtree(backup_dir)
-            shutil.copytree(source_dir, backup_dir)
+            backup_dir = os.path.join(backup_root, item_def.path)
+            _mirror_tree(source_dir, backup_dir)
             return True
         return False
 
-    if item_def["type"] == "glob":
-        pattern = os.path.join(target_dir, item_def["path"])
-        matches = [match for match in glob(pattern, recursive=True) if os.path.isfile(match)]
-        copied_any = False
+    if item_def.type == "glob":
+        matches = _expand_glob_item(target_dir, item_def)
+        if not matches:
+            return False
+        # Matches are all "<target_dir>/<subdir>/<name>", so the relative path is a prefix strip
+        prefix_len = len(os.path.join(target_dir, ""))
+        _ensure_dir(os.path.join(backup_root, os.path.dirname(item_def.path)), created_dirs)
+        backup_prefix = os.path.join(backup_root, "")
         for match in matches:
-            relative = os.path.relpath(match, target_dir)
-            backup_path = os.path.join(backup_root, relative)
-            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-            shutil.copy2(match, backup_path)
-            copied_any = True
-        return copied_any
+            _fast_copy(match, backup_prefix + match[prefix_len:])
+        return True
 
     return False
 
 
-def _copy_preference_item(source_dir: str, target_dir: str, item_def: dict):
-    """Copy a single preference item from source to target. Returns (copied_paths, missing_paths)."""
+def _scandir_glob(dir_path: str, name_match) -> list:
+    """Return paths of the files directly inside dir_path whose name satisfies name_match.
+
+    ``name_match`` is one of _GLOB_NAME_MATCHERS. A single scandir pass; DirEntry.is_file()
+    uses the type information returned with the directory listing instead of issuing a stat
+    call per entry.
+    """
+    normcase = os.path.normcase
+    try:
+        with os.scandir(dir_path) as entries:
+            return [
+                entry.path for entry in entries
+                if name_match(normcase(entry.name)) and entry.is_file(follow_symlinks=False)
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _expand_glob_item(base_dir: str, item_def: PrefItem) -> list:
+    """Return the files under base_dir matching a glob preference item."""
+    # Preference globs only wildcard the file name (e.g. Containers/ShortcutBar*.xml)
+    return _scandir_glob(os.path.join(base_dir, os.path.dirname(item_def.path)), _GLOB_NAME_MATCHERS[item_def.id])
+
+
+def _index_source_items(source_dir: str, selected_items: list) -> dict:
+    """Resolve every selected item against the source folder with one scandir per folder.
+
+    Returns {item id: existing source paths}: the file or folder for file/folder items and
+    the matching files for glob items. An empty list means the item is missing at the source.
+    The items only touch the character folder, Containers/ and DockAreas/, so this is at most
+    three directory listings however many items are selected.
+    """
+    listings = {}  # subdir -> {normcased name: DirEntry}
+
+    def listing(subdir):
+        if subdir not in listings:
+            try:
+                with os.scandir(os.path.join(source_dir, subdir)) as entries:
+                    # normcase keeps lookups case-insensitive on Windows, like the filesystem
+                    listings[subdir] = {os.path.normcase(entry.name): entry for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                listings[subdir] = {}
+        return listings[subdir]
+
+    index = {}
+    for item in selected_items:
+        subdir, name = os.path.split(item.path)
+        entries = listing(subdir)
+        if item.type == "glob":
+            name_match = _GLOB_NAME_MATCHERS[item.id]
+            index[item.id] = [
+                entry.path for folded_name, entry in entries.items()
+                if name_match(folded_name) and entry.is_file(follow_symlinks=False)
+            ]
+            continue
+        entry = entries.get(os.path.normcase(name))
+        if entry is not None and (entry.is_dir() if item.type == "folder" else entry.is_file()):
+            index[item.id] = [entry.path]
+        else:
+            index[item.id] = []
+    return index
+
+
+def _copy_preference_item(source_dir: str, target_dir: str, item_def: PrefItem, created_dirs: set,
+                          precomputed_matches=None):
+    """Copy a single preference item from source to target. Returns (copied_paths, missing_paths).
+
+    ``precomputed_matches`` may carry the item's entry from _index_source_items() so the
+    source folder is not probed again for every target; an empty list marks it missing.
+    """
     copied_paths = []
     missing_paths = []
 
-    if item_def["type"] == "file":
-        source_path = os.path.join(source_dir, item_def["path"])
-        if os.path.isfile(source_path):
-            dest_path = os.path.join(target_dir, item_def["path"])
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            shutil.copy2(source_path, dest_path)
-            copied_paths.append(item_def["path"])
+    if precomputed_matches is not None and not precomputed_matches:
+        missing_paths.append(item_def.path)
+        return copied_paths, missing_paths
+
+    if item_def.type == "file":
+        source_path = os.path.join(source_dir, item_def.path)
+        dest_path = os.path.join(target_dir, item_def.path)
+        if _copy_file_if_present(source_path, dest_path, created_dirs):
+            copied_paths.append(item_def.path)
         else:
-            missing_paths.append(item_def["path"])
+            missing_paths.append(item_def.path)
         return copied_paths, missing_paths
 
-    if item_def["type"] == "folder":
-        source_path = os.path.join(source_dir, item_def["path"])
-        if os.path.isdir(source_path):
-            dest_path = os.path.join(target_dir, item_def["path"])
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            if os.path.isdir(dest_path):
-                shutil.rmtree(dest_path)
-            shutil.copytree(source_path, dest_path)
-            copied_paths.append(item_def["path"])
+    if item_def.type == "folder":
+        source_path = os.path.join(source_dir, item_def.path)
+        if precomputed_matches or os.path.isdir(source_path):
+            dest_path = os.path.join(target_dir, item_def.path)
+            _ensure_dir(os.path.dirname(dest_path), created_dirs)
+            _mirror_tree(source_path, dest_path)
+            copied_paths.append(item_def.path)
         else:
-            missing_paths.append(item_def["path"])
+            missing_paths.append(item_def.path)
         return copied_paths, missing_paths
 
-    if item_def["type"] == "glob":
-        pattern = os.path.join(source_dir, item_def["path"])
-        matches = [match for match in glob(pattern, recursive=True) if os.path.isfile(match)]
+    if item_def.type == "glob":
+        if precomputed_matches is not None:
+            matches = precomputed_matches
+        else:
+            matches = _expand_glob_item(source_dir, item_def)
         if not matches:
-            missing_paths.append(item_def["path"])
+            missing_paths.append(item_def.path)
             return copied_paths, missing_paths
 
+        # Matches are all "<source_dir>/<subdir>/<name>" and share one destination folder,
+        # so strip the source prefix instead of calling relpath/join per file
+        prefix_len = len(os.path.join(source_dir, ""))
+        _ensure_dir(os.path.join(target_dir, os.path.dirname(item_def.path)), created_dirs)
+        dest_prefix = os.path.join(target_dir, "")
         for match in matches:
-            relative = os.path.relpath(match, source_dir)
-            dest_path = os.path.join(target_dir, relative)
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            shutil.copy2(match, dest_path)
+            relative = match[prefix_len:]
+            _fast_copy(match, dest_prefix + relative)
             copied_paths.append(relative)
 
         return copied_paths, missing_paths
 
-    missing_paths.append(item_def.get("path", "unknown"))
+    missing_paths.append(item_def.path)
     return copied_paths, missing_paths
 
+
+def _accounts_key(all_accounts) -> tuple:
+    """Hashable summary of the account payload: ((accountName, (characterName, ...)), ...)."""
+    return tuple(
+        (account.get('accountName', ''),
+         tuple(char.get('characterName', '') for char in account.get('characters', [])))
+        for account in all_accounts
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_char_index(accounts_key: tuple):
+    """Build (char_to_account, char_trie) for an accounts key, memoized across requests.
+
+    The frontend sends the same account list on every call, so repeated checks reuse the
+    index. The returned objects are shared and must not be modified.
+    """
+    char_to_account = _build_char_to_account(accounts_key)
+    return char_to_account, _CharTrie.from_mapping(char_to_account)
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_launch_paths(game_folder: str, dll_folder: str):
+    """Memoized DLL/game folder check; an 'ok' result stays cached until the process restarts (see _validate_launch_paths)."""
+    dll_path = os.path.join(dll_folder, "AOQuickLauncher.dll")
+    if not os.path.isfile(dll_path):
+        return 'dll_missing', dll_path
+    if not os.path.isdir(game_folder):
+        return 'game_missing', dll_path
+    return 'ok', dll_path
+
+
+def _validate_launch_paths(game_folder: str, dll_folder: str):
+    """Return (status, dll_path) where status is 'ok', 'dll_missing' or 'game_missing'.
+
+    Successful checks are remembered for the life of the process; a failed check clears
+    the cache so that fixing the folders is picked up on the next launch.
+    """
+    result = _cached_launch_paths(game_folder, dll_folder)
+    if result[0] != 'ok':
+        _cached_launch_paths.cache_clear()
+    return result
+
+
+@functools.lru_cache(maxsize=4)
+def _launch_environment(game_folder: str):
+    """Read-only copy of the server environment with AOPath set, shared by all launches."""
+    env = os.environ.copy()
+    env['AOPath'] = game_folder
+    return types.MappingProxyType(env)
+
+
+def _spawn_launcher(command, dll_folder: str, env):
+    """Start one launcher process without waiting for it. Returns (process, stderr_file)."""
+    # stderr goes to an anonymous temp file rather than a pipe: a long-running launcher
+    # can never block on a full pipe buffer, and closing our handle after the probe
+    # does not break its writes. stdout is never read, so it is discarded.
+    stderr_file = tempfile.TemporaryFile()
+    try:
+        # Use subprocess.Popen to run the command without waiting for it to finish.
+        # This allows the server to respond immediately while the game launches.
+        # cwd (current working directory) is set to the DLL folder as that's where the launcher is.
+        # The AOPath environment variable tells the launcher where the game is installed.
+        process = subprocess.Popen(command,
+                                   cwd=dll_folder,
+                                   env=env,  # Pass the environment with AOPath
+                                   stdout=subprocess.DEVNULL,
+                                   stderr=stderr_file,
+                                   creationflags=subprocess.CREATE_NEW_CONSOLE if _IS_WINDOWS else 0)
+    except Exception:
+        stderr_file.close()
+        raise
+    return process, stderr_file
+
+
+def _copy_preferences_to_target(source_dir: str, source_account: str, source_character_id, target_account: str,
+                                target_character_id, target_dir: str, selected_items: list, source_matches: dict,
+                                backup_name):
+    """Back up (when backup_name is set) and copy the selected items into one target. Returns (result, errors)."""
+    errors = []
+    created_dirs = set()  # directories already ensured for this target
+    _ensure_dir(target_dir, created_dirs)
+
+    backup_dir = None
+    backed_up_items = []
+    if backup_name:
+        backup_dir = os.path.join(target_dir, backup_name)
+        for item in selected_items:
+            try:
+                if _backup_preference_item(target_dir, backup_dir, item, created_dirs):
+                    backed_up_items.append(item.label)
+            except Exception as backup_error:
+                logger.error(
+                    "Failed to back up %s for %s/%s: %s",
+                    item.label,
+                    target_account,
+                    target_character_id,
+                    backup_error,
+                    exc_info=True
+                )
+                errors.append(
+                    f"Backup failed for {target_account}/{target_character_id} item {item.label}: {backup_error}"
+                )
+
+    copied_details = []
+    missing_details = []
+
+    for item in selected_items:
+        try:
+            copied_paths, missing_paths = _copy_preference_item(
+                source_dir, target_dir, item, created_dirs, source_matches.get(item.id)
+            )
+            if copied_paths:
+                copied_details.append({
+                    "itemId": item.id,
+                    "label": item.label,
+                    "paths": copied_paths
+                })
+            if missing_paths:
+                missing_details.append({
+                    "itemId": item.id,
+                    "label": item.label,
+                    "paths": missing_paths
+                })
+        except Exception as copy_error:
+            logger.error(
+                "Failed to copy %s from %s/%s to %s/%s: %s",
+                item.label,
+                source_account,
+                source_character_id,
+                target_account,
+                target_character_id,
+                copy_error,
+                exc_info=True
+            )
+            errors.append(
+                f"Copy failed for {target_account}/{target_character_id} item {item.label}: {copy_error}"
+            )
+
+    return {
+        "accountName": target_account,
+        "characterId": str(target_character_id),
+        "copied": copied_details,
+        "missing": missing_details,
+        "backupDirectory": backup_dir if backed_up_items else None,
+        "backedUpItems": backed_up_items
+    }, errors
+
+
+def _plan_preference_copy(data: dict):
+    """Validate a preference copy request and resolve its target folders.
+
+    A target listed more than once (same account, case-insensitively, and character ID) is
+    collapsed into one job; the repeats are logged and get no entry in the results.
+    Returns (plan, None), or (None, (error_payload, status)) if the request is invalid.
+    """
+    base_path = (data.get('prefsBasePath') or '').strip()
+    source_info = data.get('source') or {}
+    targets_info = data.get('targets') or []
+    requested_items = data.get('items') or []
+    create_backup = bool(data.get('createBackup'))
+
+    if not base_path:
+        return None, ({
+            "status": "error",
+            "message": "Preference base path is required"
+        }, 400)
+
+    if not os.path.isdir(base_path):
+        return None, ({
+            "status": "error",
+            "message": f"Preference base path does not exist: {base_path}"
+        }, 400)
+
+    source_account = (source_info.get('accountName') or '').strip()
+    source_character_id = source_info.get('characterId')
+
+    if not source_account or source_character_id in (None, ''):
+        return None, ({
+            "status": "error",
+            "message": "Source account and character must be specified"
+        }, 400)
+
+    if not isinstance(targets_info, list) or len(targets_info) == 0:
+        return None, ({
+            "status": "error",
+            "message": "At least one target character must be selected"
+        }, 400)
+
+    selected_items = []
+    invalid_items = []
+    for item_id in requested_items:
+        item_def = PREFERENCE_ITEMS.get(item_id)
+        if item_def:
+            selected_items.append(item_def)
+        else:
+            invalid_items.append(item_id)
+
+    if not selected_items:
+        return None, ({
+            "status": "error",
+            "message": "No valid preference items were requested for copying"
+        }, 400)
+
+    source_dir = _get_character_prefs_path(base_path, source_account, source_character_id)
+    if not source_dir or not os.path.isdir(source_dir):
+        return None, ({
+            "status": "error",
+            "message": f"Source character preferences not found at {source_dir or 'unknown path'}"
+        }, 400)
+
+    logger.info(
+        "Copying preferences from %s/%s to %d target(s) with items %s",
+        source_account,
+        source_character_id,
+        len(targets_info),
+        [item.id for item in selected_items]
+    )
+
+    # The source folder is the same for every target, so resolve the items against it only once
+    source_matches = _index_source_items(source_dir, selected_items)
+
+    errors = []
+    target_jobs = []  # (account name, character id, target directory)
+    queued_targets = set()
+
+    source_identifier = (source_account.lower(), str(source_character_id))
+
+    for target in targets_info:
+        target_account = (target.get('accountName') or '').strip()
+        target_character_id = target.get('characterId')
+
+        if not target_account or target_character_id in (None, ''):
+            error_msg = "Target account and character must be provided"
+            errors.append(error_msg)
+            logger.error(error_msg)
+            continue
+
+        target_identifier = (target_account.lower(), str(target_character_id))
+        if target_identifier == source_identifier:
+            logger.info("Skipping target identical to source: %s/%s", target_account, target_character_id)
+            continue
+        if target_identifier in queued_targets:
+            # Copying twice into the same folder from parallel workers would race
+            logger.info("Skipping duplicate target %s/%s", target_account, target_character_id)
+            continue
+        queued_targets.add(target_identifier)
+
+        target_dir = _get_character_prefs_path(base_path, target_account, target_character_id)
+        if not target_dir:
+            error_msg = f"Unable to determine target directory for {target_account}/{target_character_id}"
+            errors.append(error_msg)
+            logger.error(error_msg)
+            continue
+
+        target_jobs.append((target_account, target_character_id, target_dir))
+
+    return {
+        "source_dir": source_dir,
+        "source_account": source_account,
+        "source_character_id": source_character_id,
+        "selected_items": selected_items,
+        "invalid_items": invalid_items,
+        "source_matches": source_matches,
+        # Shared by every target so one request's backups carry the same folder name
+        "backup_name": f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}" if create_backup else None,
+        "target_jobs": target_jobs,
+        "errors": errors
+    }, None
+
+
+def _submit_copy_jobs(executor, plan: dict) -> list:
+    """Queue every planned target on executor. Returns [(account, character id, future), ...]."""
+    return [
+        (
+            target_account,
+            target_character_id,
+            executor.submit(
+                _copy_preferences_to_target,
+                plan["source_dir"],
+                plan["source_account"],
+                plan["source_character_id"],
+                target_account,
+                target_character_id,
+                target_dir,
+                plan["selected_items"],
+                plan["source_matches"],
+                plan["backup_name"]
+            )
+        )
+        for target_account, target_character_id, target_dir in plan["target_jobs"]
+    ]
+
+
+def _copy_job_outcome(target_account: str, target_character_id, future):
+    """Return (result, errors) of a finished target copy; result is None if the copy raised."""
+    try:
+        return future.result()
+    except Exception as target_error:
+        logger.error(
+            "Failed to copy preferences to %s/%s: %s",
+            target_account,
+            target_character_id,
+            target_error,
+            exc_info=True
+        )
+        return None, [f"Copy failed for {target_account}/{target_character_id}: {target_error}"]
+
+
+def _copy_summary(plan: dict, results: list, errors: list):
+    """Build the (payload, status) returned once every target of a copy request has finished."""
+    if not results and errors:
+        return {
+            "status": "error",
+            "message": "Preference copy failed for all targets",
+            "errors": errors,
+            "invalidItems": plan["invalid_items"]
+        }, 500
+
+    status = "success" if not errors else "partial_success"
+    message = f"Copied preferences to {len(results)} character(s)."
+    if errors:
+        message += " Some items encountered issues."
+
+    return {
+        "status": status,
+        "message": message,
+        "results": results,
+        "errors": errors,
+        "invalidItems": plan["invalid_items"]
+    }, 200
+
+
+def _sse_event(event: str, payload) -> bytes:
+    """Encode one Server-Sent Event with a JSON data line."""
+    return b"event: " + event.encode() + b"\ndata: " + _dumps_json(payload) + b"\n\n"
+
+
+def _render_page(template_name: str):
+    """Render a page once and serve the cached HTML afterwards (re-rendered every time in debug mode).
+
+    The templates take no per-request data, so the output only changes when the app is updated.
+    The first render happens inside a request because the templates build their static URLs with
+    url_for. An ETag lets the browser revalidate with a 304 instead of downloading the page again.
+    """
+    if app.debug:
+        return render_template(template_name)
+    page = _page_cache.get(template_name)
+    if page is None:
+        html = render_template(template_name)
+        page = _page_cache[template_name] = (html, hashlib.sha1(html.encode('utf-8')).hexdigest())
+    html, etag = page
+    response = app.response_class(html, mimetype='text/html')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
 @app.route('/')
 def index():
     """Serves the main HTML page."""
-    return render_template('index.html')
+    return _render_page('index.html')
 
 
 @app.route('/preferences')
 def preferences():
     """Serves the character preferences management page."""
-    return render_template('preferences.html')
+    return _render_page('preferences.html')
 
 @app.route('/check_and_focus_window', methods=['POST'])
 def check_and_focus_window():
@@ -184,73 +921,70 @@ def check_and_focus_window():
     for any character on the same account as the ones being launched.
     Returns detailed information about conflicts per character/account.
     """
-    data = request.json
+    data = _request_json() or {}
     all_accounts = data.get('allAccounts', [])
-    selected_accounts = data.get('selectedAccounts', [])
+    selected_accounts = _selected_account_set(data)
+
+    if selected_accounts is None:
+        return _json_response({
+            "status": "error",
+            "message": "selectedAccounts must be a list of account names",
+            "conflicts": []
+        }, 400)
     
     if not all_accounts or not selected_accounts:
         logger.error("No account data provided for checking")
-        return jsonify({
+        return _json_response({
             "status": "error",
             "message": "No account data provided",
             "conflicts": []
-        }), 400
+        }, 400)
     
-    if platform.system() != 'Windows':
+    if not _IS_WINDOWS:
         logger.warning("Window checking is only supported on Windows")
-        return jsonify({
-            "status": "unsupported",
-            "message": "Window checking is only supported on Windows",
-            "conflicts": []
-        }), 200
+        return _unsupported_response("window_check")
     
     try:
-        # Build a complete map of all character names to their account names
-        char_to_account_map = {}  # Map character names to account names
-        
-        for account in all_accounts:
-            acc_name = account.get('accountName', '')
-            characters = account.get('characters', [])
-            
-            for char in characters:
-                char_name = char.get('characterName', '')
-                if acc_name and char_name:
-                    char_to_account_map[char_name.lower()] = acc_name
-        
-        logger.info(f"Built character map with {len(char_to_account_map)} characters")
-        logger.info(f"Checking for conflicts with selected accounts: {selected_accounts}")
+        # Find all windows with "Anarchy Online - " prefix and extract the character name
+        ao_windows = _get_visible_windows()
+        running_characters = [char_name for _, char_name, _ in ao_windows]
         
-        # Find all windows with "Anarchy Online - " prefix
-        def enum_windows_callback(hwnd, windows_info):
-            if win32gui.IsWindowVisible(hwnd):
-                window_text = win32gui.GetWindowText(hwnd)
-                if window_text.startswith("Anarchy Online - "):
-                    # Extract character name from window title
-                    character_name = window_text[len("Anarchy Online - "):]
-                    windows_info.append(character_name)
-            return True
-        
-        running_characters = []
-        win32gui.EnumWindows(enum_windows_callback, running_characters)
+        logger.info("Found %d Anarchy Online window(s)", len(running_characters))
+
+        if not ao_windows:
+            # Nothing is running (the common case), so there is nothing to map to accounts
+            return _json_response({
+                "status": "no_conflicts",
+                "message": "No conflicts detected - safe to launch",
+                "conflicts": [],
+                "conflictedAccounts": [],
+                "runningCharacters": running_characters
+            }, 200)
+
+        # Build a complete map of all character names to their account names
+        char_to_account_map, char_trie = _cached_char_index(_accounts_key(all_accounts))
         
-        logger.info(f"Found {len(running_characters)} Anarchy Online window(s)")
+        logger.info("Using character map with %d characters", len(char_to_account_map))
+        logger.debug("Character index cache: %s", _cached_char_index.cache_info())
+        logger.info("Checking for conflicts with selected accounts: %s", selected_accounts)
         
         # Track conflicts per account
         conflicts = []
-        conflicted_accounts = set()
+        # Accounts in the order their first conflict was found; the set only guards the list
+        conflicted_accounts = []
+        seen_accounts = set()
         
         # Check each running character
-        for running_char_name in running_characters:
-            logger.info(f"Found running character: {running_char_name}")
-            
+        unknown_characters = []
+        for _, running_char_name, char_key in ao_windows:
             # Check if we can identify which account this character belongs to
-            if running_char_name.lower() in char_to_account_map:
-                acc_name = char_to_account_map[running_char_name.lower()]
-                logger.info(f"Character '{running_char_name}' belongs to account '{acc_name}'")
-                
+            acc_name = _lookup_account(char_key, char_to_account_map, char_trie)
+            if acc_name is not None:
                 # Check if this account is one of the selected accounts
                 if acc_name in selected_accounts:
-                    conflicted_accounts.add(acc_name)
+                    if acc_name not in seen_accounts:
+                        seen_accounts.add(acc_name)
+                        conflicted_accounts.append(acc_name)
                     conflicts.append({
                         'account': acc_name,
                         'character': running_char_name,
@@ -259,38 +993,40 @@ def check_and_focus_window():
                     })
             else:
                 # Unknown character - we can't determine the account
-                logger.info(f"Found unknown character '{running_char_name}' - cannot determine account")
-        
+                unknown_characters.append(running_char_name)
+
+        logger.info("Running characters: %s (unknown accounts: %s)", running_characters, unknown_characters)
+
         # Build the response
         if conflicts:
-            return jsonify({
+            return _json_response({
                 "status": "conflicts_found",
                 "message": f"Found conflicts for {len(conflicted_accounts)} account(s)",
                 "conflicts": conflicts,
-                "conflictedAccounts": list(conflicted_accounts),
+                "conflictedAccounts": conflicted_accounts,
                 "runningCharacters": running_characters
-            }), 200
+            }, 200)
         else:
             # No conflicts found - safe to launch
             # We don't care about unknown characters since they can't be from our accounts
-            logger.info(f"No conflicts found. {len(running_characters)} running character(s) detected but none conflict with selected accounts")
-            return jsonify({
+            logger.info("No conflicts found. %d running character(s) detected but none conflict with selected accounts", len(running_characters))
+            return _json_response({
                 "status": "no_conflicts",
                 "message": "No conflicts detected - safe to launch",
                 "conflicts": [],
                 "conflictedAccounts": [],
                 "runningCharacters": running_characters
-            }), 200
+            }, 200)
             
     except Exception as e:
-        logger.error(f"Error checking windows: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Error checking windows: %s", e, exc_info=True)
+        return _json_response({
             "status": "error",
             "message": f"Error checking windows: {str(e)}",
             "conflicts": [],
             "conflictedAccounts": [],
             "runningCharacters": []
-        }), 500
+        }, 500)
 
 @app.route('/launch', methods=['POST'])
 def launch_game():
@@ -298,43 +1034,42 @@ def launch_game():
     Handles the POST request to launch the game.
     It receives the game and DLL paths, and a list of characters to launch.
     """
-    data = request.json
+    data = _request_json() or {}
     game_folder = data.get('gameFolder')
     dll_folder = data.get('dllFolder')
     characters_to_launch = data.get('characters')
 
-    logger.info(f"Launch request received - Game folder: {game_folder}, DLL folder: {dll_folder}")
+    logger.info("Launch request received - Game folder: %s, DLL folder: %s", game_folder, dll_folder)
     # Do NOT log plaintext passwords. Log only non-sensitive metadata about characters.
-    try:
-        safe_chars = [{'accountName': c.get('accountName'), 'characterId': c.get('characterId')} for c in (characters_to_launch or [])]
-    except Exception:
-        safe_chars = 'unavailable'
-    logger.info(f"Characters to launch (passwords redacted): {safe_chars}")
+    if logger.isEnabledFor(logging.DEBUG):
+        try:
+            safe_chars = [{'accountName': c.get('accountName'), 'characterId': c.get('characterId')} for c in (characters_to_launch or [])]
+        except Exception:
+            safe_chars = 'unavailable'
+        logger.debug("Characters to launch (passwords redacted): %s", safe_chars)
 
     if not game_folder or not dll_folder or not characters_to_launch:
         logger.error("Missing required data in launch request")
-        return jsonify({"status": "error", "message": "Missing required data."}), 400
+        return _json_response({"status": "error", "message": "Missing required data."}, 400)
 
-    # Construct the full path to the AOQuickLauncher.dll
-    dll_path = os.path.join(dll_folder, "AOQuickLauncher.dll")
+    # Check that the DLL and the game folder exist
+    path_status, dll_path = _validate_launch_paths(game_folder, dll_folder)
+    if path_status == 'dll_missing':
+        logger.error("DLL not found at: %s", dll_path)
+        return _json_response({"status": "error", "message": f"DLL not found at: {dll_path}"}, 404)
 
-    # Check if the DLL exists (optional but good practice)
-    if not os.path.exists(dll_path):
-        logger.error(f"DLL not found at: {dll_path}")
-        return jsonify({"status": "error", "message": f"DLL not found at: {dll_path}"}), 404
-
-    # Check if the game folder exists
-    if not os.path.exists(game_folder):
-        logger.error(f"Game folder not found at: {game_folder}")
-        return jsonify({"status": "error", "message": f"Game folder not found at: {game_folder}"}), 404
+    if path_status == 'game_missing':
+        logger.error("Game folder not found at: %s", game_folder)
+        return _json_response({"status": "error", "message": f"Game folder not found at: {game_folder}"}, 404)
 
     launched_processes = []
     errors = []
+    pending = []  # (account name, character id, command) to start
+    spawned = []  # (account name, character id, Popen, stderr file) awaiting the failure probe
 
     # Set up environment variables - AOPath is required by the launcher
-    env = os.environ.copy()
-    env['AOPath'] = game_folder
-    logger.info(f"Setting AOPath environment variable to: {game_folder}")
+    env = _launch_environment(game_folder)
+    logger.info("Setting AOPath environment variable to: %s", game_folder)
 
     for char_info in characters_to_launch:
         acc_name = char_info.get('accountName')
@@ -357,94 +1092,90 @@ def launch_game():
             str(char_id) # Ensure character ID is a string
         ]
 
-        # Avoid logging plaintext passwords. Redact the password argument for safety.
-        try:
-            redacted_command = list(command)
-            # Expecting structure: [exe, dll_path, acc_name, password, char_id]
-            if len(redacted_command) > 3:
-                redacted_command[3] = '***REDACTED***'
-        except Exception:
-            redacted_command = ['[redacted]']
+        if logger.isEnabledFor(logging.DEBUG):
+            # Avoid logging plaintext passwords. Redact the password argument for safety.
+            try:
+                redacted_command = list(command)
+                # Expecting structure: [exe, dll_path, acc_name, password, char_id]
+                if len(redacted_command) > 3:
+                    redacted_command[3] = '***REDACTED***'
+            except Exception:
+                redacted_command = ['[redacted]']
+
+            logger.debug("Executing command: %s", redacted_command)
+            logger.debug("Working directory: %s", dll_folder)
+
+        pending.append((acc_name, char_id, command))
+
+    if pending:
+        # Process creation is independent per character, so overlap it on a small pool
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            futures = [executor.submit(_spawn_launcher, command, dll_folder, env) for _, _, command in pending]
+            for (acc_name, char_id, _), future in zip(pending, futures):
+                try:
+                    process, stderr_file = future.result()
+                    spawned.append((acc_name, char_id, process, stderr_file))
+                except Exception as e:
+                    error_msg = f"Failed to launch {acc_name}/{char_id}: {str(e)}"
+                    errors.append(error_msg)
+                    logger.error(error_msg, exc_info=True)
+
+    if spawned:
+        # Wait once for all launchers, then check whether any of them failed immediately.
+        # This replaces a blocking 0.5s communicate() per character.
+        time.sleep(LAUNCH_FAILURE_PROBE_SECONDS)
+
+    for acc_name, char_id, process, stderr_file in spawned:
+        returncode = process.poll()
+        if returncode is not None and returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+            stderr_file.close()
+            error_msg = stderr.decode('utf-8', errors='ignore') if stderr else 'Unknown error'
+            errors.append(f"Failed to launch {acc_name}/{char_id}: Process exited with code {returncode}. Error: {error_msg}")
+            continue
 
-        logger.info(f"Executing command: {' '.join(redacted_command)}")
-        logger.info(f"Working directory: {dll_folder}")
+        stderr_file.close()
+        launched_processes.append(f"Launched {acc_name}/{char_id} (PID: {process.pid})")
+        logger.info("Successfully launched %s/%s with PID: %s", acc_name, char_id, process.pid)
 
-        try:
-            # Use subprocess.Popen to run the command without waiting for it to finish.
-            # This allows the server to respond immediately while the game launches.
-            # cwd (current working directory) is set to the DLL folder as that's where the launcher is.
-            # The AOPath environment variable tells the launcher where the game is installed.
-            process = subprocess.Popen(command,
-                                       cwd=dll_folder,  # Changed to dll_folder
-                                       env=env,  # Pass the environment with AOPath
-                                       stdout=subprocess.PIPE,
-                                       stderr=subprocess.PIPE,
-                                       creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0)
-            
-            # Try to read initial output to catch immediate errors
-            # Wait a short time to see if the process fails immediately
-            try:
-                stdout, stderr = process.communicate(timeout=0.5)
-                if process.returncode is not None and process.returncode != 0:
-                    error_msg = stderr.decode('utf-8', errors='ignore') if stderr else 'Unknown error'
-                    errors.append(f"Failed to launch {acc_name}/{char_id}: Process exited with code {process.returncode}. Error: {error_msg}")
-                    continue
-            except subprocess.TimeoutExpired:
-                # This is expected - the process should continue running
-                pass
-            
-            launched_processes.append(f"Launched {acc_name}/{char_id} (PID: {process.pid})")
-            logger.info(f"Successfully launched {acc_name}/{char_id} with PID: {process.pid}")
-        except Exception as e:
-            error_msg = f"Failed to launch {acc_name}/{char_id}: {str(e)}"
-            errors.append(error_msg)
-            logger.error(error_msg, exc_info=True)
+    if launched_processes:
+        # New game windows are about to appear
+        _invalidate_window_cache()
 
     if errors:
-        logger.warning(f"Partial success - Launched: {len(launched_processes)}, Errors: {len(errors)}")
-        return jsonify({
+        logger.warning("Partial success - Launched: %d, Errors: %d", len(launched_processes), len(errors))
+        return _json_response({
             "status": "partial_success",
             "message": "Some launches failed.",
             "launched": launched_processes,
             "errors": errors
-        }), 200
+        }, 200)
     else:
-        logger.info(f"All {len(launched_processes)} characters launched successfully!")
-        return jsonify({
+        logger.info("All %d characters launched successfully!", len(launched_processes))
+        return _json_response({
             "status": "success",
             "message": "All selected characters launched successfully!",
             "launched": launched_processes
-        }), 200
+        }, 200)
 
 @app.route('/focus_launcher_window', methods=['POST'])
 def focus_launcher_window():
     """
     Focuses the "Knows Modded AO#" window after launching characters.
     """
-    window_title = "Knows Modded AO#"
+    window_title = _LAUNCHER_WINDOW_TITLE
     
-    if platform.system() != 'Windows':
+    if not _IS_WINDOWS:
         logger.warning("Window focusing is only supported on Windows")
-        return jsonify({
-            "status": "unsupported",
-            "message": "Window focusing is only supported on Windows"
-        }), 200
+        return _unsupported_response("window_focus")
     
     try:
-        # Find window by title
-        def enum_windows_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                window_text = win32gui.GetWindowText(hwnd)
-                if window_text == window_title:
-                    windows.append(hwnd)
-            return True
+        # Find window by its exact title
+        hwnd = _find_visible_window(window_title)
         
-        windows = []
-        win32gui.EnumWindows(enum_windows_callback, windows)
-        
-        if windows:
+        if hwnd:
             # Window found - bring it to foreground
-            hwnd = windows[0]  # Take the first matching window
             
             try:
                 # Show window if minimized
@@ -454,343 +1185,315 @@ def focus_launcher_window():
                 # Bring window to foreground
                 win32gui.SetForegroundWindow(hwnd)
             except Exception as e:
-                logger.warning(f"Could not focus launcher window: {str(e)}")
+                logger.warning("Could not focus launcher window: %s", e)
                 # Continue - this is not a critical error
-                return jsonify({
+                return _json_response({
                     "status": "partial_success",
                     "message": f"Found launcher window but could not focus it: {str(e)}"
-                }), 200
+                }, 200)
             
-            logger.info(f"Found and focused launcher window: {window_title}")
-            return jsonify({
+            logger.info("Found and focused launcher window: %s", window_title)
+            return _json_response({
                 "status": "success",
                 "message": f"Launcher window '{window_title}' brought to foreground"
-            }), 200
+            }, 200)
         else:
-            logger.info(f"Launcher window not found: {window_title}")
-            return jsonify({
+            logger.info("Launcher window not found: %s", window_title)
+            return _json_response({
                 "status": "not_found",
                 "message": f"Launcher window '{window_title}' not found"
-            }), 200
+            }, 200)
             
     except Exception as e:
-        logger.error(f"Error focusing launcher window: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Error focusing launcher window: %s", e, exc_info=True)
+        return _json_response({
             "status": "error",
             "message": f"Error focusing window: {str(e)}"
-        }), 500
+        }, 500)
 
 @app.route('/close_running_instances', methods=['POST'])
 def close_running_instances():
     """
     Closes running game instances for selected accounts by sending Alt+F4 twice.
     """
-    data = request.json
-    selected_accounts = data.get('selectedAccounts', [])
+    data = _request_json() or {}
+    selected_accounts = _selected_account_set(data)
     all_accounts = data.get('allAccounts', [])
+
+    if selected_accounts is None:
+        return _json_response({
+            "status": "error",
+            "message": "selectedAccounts must be a list of account names"
+        }, 400)
     
     if not selected_accounts or not all_accounts:
-        return jsonify({
+        return _json_response({
             "status": "error",
             "message": "No accounts specified"
-        }), 400
+        }, 400)
     
-    if platform.system() != 'Windows':
-        return jsonify({
-            "status": "unsupported",
-            "message": "Window management is only supported on Windows"
-        }), 200
+    if not _IS_WINDOWS:
+        return _unsupported_response("window_close")
     
     try:
         # Build a map of character names to accounts
-        char_to_account = {}
-        for acc_name in selected_accounts:
-            for account in all_accounts:
-                if account['accountName'] == acc_name:
-                    for char in account['characters']:
-                        char_to_account[char['characterName'].lower()] = acc_name
-                    break
+        # Same index as check_and_focus_window (so the cache entry is shared); windows of
+        # accounts that are not selected are filtered out below
+        char_to_account, char_trie = _cached_char_index(_accounts_key(all_accounts))
+        logger.debug("Character index cache: %s", _cached_char_index.cache_info())
 
         # Find windows for selected accounts
         windows_to_close = {}
-        def enum_windows_callback(hwnd, _):
-            if win32gui.IsWindowVisible(hwnd):
-                window_text = win32gui.GetWindowText(hwnd)
-                if window_text.startswith("Anarchy Online - "):
-                    char_name = window_text[len("Anarchy Online - "):]
-                    acc_name = char_to_account.get(char_name.lower())
-                    if acc_name in selected_accounts:
-                        windows_to_close[hwnd] = char_name
-                        logger.info(f"Will close window for character {char_name} (account: {acc_name})")
-            return True
-
-        win32gui.EnumWindows(enum_windows_callback, None)
-        
-        closed_count = 0
-        for hwnd, char_name in windows_to_close.items():
-            # Send WM_CLOSE message twice with a small delay
+        for hwnd, char_name, char_key in _get_visible_windows():
+            acc_name = _lookup_account(char_key, char_to_account, char_trie)
+            if acc_name in selected_accounts:
+                windows_to_close[hwnd] = char_name
+
+        # Send WM_CLOSE to every window twice with a small delay in between (the second
+        # message confirms the client's quit prompt). PostMessage does not wait, so all
+        # windows share a single delay instead of paying it once per window.
+        for hwnd in windows_to_close:
             win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-            win32api.Sleep(100)  # Small delay between messages
+        if windows_to_close:
+            time.sleep(0.1)
+        for hwnd in windows_to_close:
             win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-            closed_count += 1
-            logger.info(f"Sent close messages to window for character: {char_name}")
-        
-        return jsonify({
+        closed_count = len(windows_to_close)
+
+        if closed_count:
+            _invalidate_window_cache()
+            logger.info("Sent close messages to %d window(s): %s", closed_count, list(windows_to_close.values()))
+
+        return _json_response({
             "status": "success",
             "message": f"Closed {closed_count} game instances"
-        }), 200
+        }, 200)
         
     except Exception as e:
-        logger.error(f"Error closing game instances: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Error closing game instances: %s", e, exc_info=True)
+        return _json_response({
             "status": "error",
             "message": f"Error closing game instances: {str(e)}"
-        }), 500
+        }, 500)
 
 
 @app.route('/copy_preferences', methods=['POST'])
 def copy_preferences():
     """Copy selected preference files from a source character to one or more targets."""
-    if platform.system() != 'Windows':
+    if not _IS_WINDOWS:
         logger.warning("Preference copying requested on unsupported platform")
-        return jsonify({
-            "status": "unsupported",
-            "message": "Character preference copying is only supported on Windows"
-        }), 200
+        return _unsupported_response("prefs_copy")
 
-    data = request.json or {}
+    plan, error = _plan_preference_copy(_request_json() or {})
+    if error:
+        return _json_response(*error)
 
-    base_path = (data.get('prefsBasePath') or '').strip()
-    source_info = data.get('source') or {}
-    targets_info = data.get('targets') or []
-    requested_items = data.get('items') or []
-    create_backup = bool(data.get('createBackup'))
-
-    if not base_path:
-        return jsonify({
-            "status": "error",
-            "message": "Preference base path is required"
-        }), 400
-
-    if not os.path.isdir(base_path):
-        return jsonify({
-            "status": "error",
-            "message": f"Preference base path does not exist: {base_path}"
-        }), 400
-
-    source_account = (source_info.get('accountName') or '').strip()
-    source_character_id = source_info.get('characterId')
-
-    if not source_account or source_character_id is None or source_character_id == '':
-        return jsonify({
-            "status": "error",
-            "message": "Source account and character must be specified"
-        }), 400
-
-    if not isinstance(targets_info, list) or len(targets_info) == 0:
-        return jsonify({
-            "status": "error",
-            "message": "At least one target character must be selected"
-        }), 400
-
-    selected_items = []
-    invalid_items = []
-    for item_id in requested_items:
-        item_def = PREFERENCE_ITEMS.get(item_id)
-        if item_def:
-            selected_items.append({**item_def, "id": item_id})
-        else:
-            invalid_items.append(item_id)
-
-    if not selected_items:
-        return jsonify({
-            "status": "error",
-            "message": "No valid preference items were requested for copying"
-        }), 400
-
-    source_dir = _get_character_prefs_path(base_path, source_account, source_character_id)
-    if not source_dir or not os.path.isdir(source_dir):
-        return jsonify({
-            "status": "error",
-            "message": f"Source character preferences not found at {source_dir or 'unknown path'}"
-        }), 400
-
-    logger.info(
-        "Copying preferences from %s/%s to %d target(s) with items %s",
-        source_account,
-        source_character_id,
-        len(targets_info),
-        [item['id'] for item in selected_items]
-    )
-
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     results = []
-    errors = []
-
-    source_identifier = (source_account.lower(), str(source_character_id))
-
-    for target in targets_info:
-        target_account = (target.get('accountName') or '').strip()
-        target_character_id = target.get('characterId')
+    errors = list(plan["errors"])
+    if plan["target_jobs"]:
+        # Targets are independent directories, so their (I/O-bound) copies can overlap
+        with ThreadPoolExecutor(max_workers=min(8, len(plan["target_jobs"]))) as executor:
+            for target_account, target_character_id, future in _submit_copy_jobs(executor, plan):
+                result, target_errors = _copy_job_outcome(target_account, target_character_id, future)
+                if result is not None:
+                    results.append(result)
+                errors.extend(target_errors)
+
+    return _json_response(*_copy_summary(plan, results, errors))
+
+
+@app.route('/copy_preferences_stream', methods=['POST'])
+def copy_preferences_stream():
+    """Copy preferences like /copy_preferences, reporting progress as Server-Sent Events.
+
+    Emits a "started" event listing the queued targets, a "target" event as each target
+    finishes, and a final "done" event carrying the /copy_preferences response body plus
+    its HTTP status. Invalid requests get the same JSON error response as /copy_preferences.
+    """
+    if not _IS_WINDOWS:
+        logger.warning("Preference copying requested on unsupported platform")
+        return _unsupported_response("prefs_copy")
+
+    plan, error = _plan_preference_copy(_request_json() or {})
+    if error:
+        return _json_response(*error)
+
+    def generate():
+        target_jobs = plan["target_jobs"]
+        yield _sse_event("started", {
+            "targets": [
+                {"accountName": target_account, "characterId": str(target_character_id)}
+                for target_account, target_character_id, _ in target_jobs
+            ]
+        })
 
-        if not target_account or target_character_id is None or target_character_id == '':
-            error_msg = "Target account and character must be provided"
-            errors.append(error_msg)
-            logger.error(error_msg)
-            continue
+        results = []
+        errors = list(plan["errors"])
+        if target_jobs:
+            with ThreadPoolExecutor(max_workers=min(8, len(target_jobs))) as executor:
+                jobs = {
+                    future: (target_account, target_character_id)
+                    for target_account, target_character_id, future in _submit_copy_jobs(executor, plan)
+                }
+                for future in as_completed(jobs):
+                    target_account, target_character_id = jobs[future]
+                    result, target_errors = _copy_job_outcome(target_account, target_character_id, future)
+                    if result is not None:
+                        results.append(result)
+                    errors.extend(target_errors)
+                    yield _sse_event("target", {
+                        "accountName": target_account,
+                        "characterId": str(target_character_id),
+                        "result": result,
+                        "errors": target_errors
+                    })
 
-        target_identifier = (target_account.lower(), str(target_character_id))
-        if target_identifier == source_identifier:
-            logger.info("Skipping target identical to source: %s/%s", target_account, target_character_id)
-            continue
+        payload, status = _copy_summary(plan, results, errors)
+        yield _sse_event("done", {**payload, "httpStatus": status})
 
-        target_dir = _get_character_prefs_path(base_path, target_account, target_character_id)
-        if not target_dir:
-            error_msg = f"Unable to determine target directory for {target_account}/{target_character_id}"
-            errors.append(error_msg)
-            logger.error(error_msg)
-            continue
+    return app.response_class(
+        generate(),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-        os.makedirs(target_dir, exist_ok=True)
 
-        backup_dir = None
-        backed_up_items = []
-        if create_backup:
-            backup_dir = os.path.join(target_dir, f"backup_{timestamp}")
-            for item in selected_items:
-                try:
-                    if _backup_preference_item(target_dir, backup_dir, item):
-                        backed_up_items.append(item["label"])
-                except Exception as backup_error:
-                    logger.error(
-                        "Failed to back up %s for %s/%s: %s",
-                        item["label"],
-                        target_account,
-                        target_character_id,
-                        backup_error,
-                        exc_info=True
-                    )
-                    errors.append(
-                        f"Backup failed for {target_account}/{target_character_id} item {item['label']}: {backup_error}"
-                    )
-
-        copied_details = []
-        missing_details = []
+def _delete_shortcutbar_target(target_account: str, target_character_id, target_dir: str, backup_name):
+    """Delete one character's shortcutbar files, first backing them up into ``backup_name`` if given.
 
-        for item in selected_items:
+    Returns (result, error).
+    """
+    backup_dir = None
+    try:
+        # Find all shortcutbar files (the same set the "Containers/ShortcutBar*.xml" copy item covers)
+        containers_dir = os.path.join(target_dir, _SHORTCUTBAR_SUBDIR)
+        shortcut_files = _scandir_glob(containers_dir, _SHORTCUTBAR_MATCH)
+
+        if not shortcut_files:
+            # An empty scan is also what a missing character folder looks like
+            if not os.path.isdir(target_dir):
+                error_msg = f"Target character preferences not found at {target_dir}"
+                logger.error(error_msg)
+                return None, error_msg
+            logger.info("No shortcutbar files found for %s/%s", target_account, target_character_id)
+            return {"accountName": target_account, "characterId": target_character_id, **_NO_SHORTCUTBARS_RESULT}, None
+
+        if backup_name:
+            # Only create the backup once there is something to put in it. The name is
+            # timestamped, so it is normally new and a plain mkdir is enough (the character
+            # folder exists, since files were found); only two requests within a second collide.
+            backup_dir = os.path.join(target_dir, backup_name)
             try:
-                copied_paths, missing_paths = _copy_preference_item(source_dir, target_dir, item)
-                if copied_paths:
-                    copied_details.append({
-                        "itemId": item["id"],
-                        "label": item["label"],
-                        "paths": copied_paths
-                    })
-                if missing_paths:
-                    missing_details.append({
-                        "itemId": item["id"],
-                        "label": item["label"],
-                        "paths": missing_paths
-                    })
-            except Exception as copy_error:
-                logger.error(
-                    "Failed to copy %s from %s/%s to %s/%s: %s",
-                    item["label"],
-                    source_account,
-                    source_character_id,
-                    target_account,
-                    target_character_id,
-                    copy_error,
-                    exc_info=True
-                )
-                errors.append(
-                    f"Copy failed for {target_account}/{target_character_id} item {item['label']}: {copy_error}"
-                )
+                os.mkdir(backup_dir)
+            except FileExistsError:
+                pass
+            # Every shortcutbar file lives directly in Containers/, so one folder holds all backups
+            backup_containers = os.path.join(backup_dir, _SHORTCUTBAR_SUBDIR)
+            try:
+                os.mkdir(backup_containers)
+            except FileExistsError:
+                pass
+            # Scanned paths are "<containers_dir>/<name>": swap the folder prefix rather than
+            # splitting and re-joining each path
+            prefix_len = len(containers_dir) + 1
+            backup_prefix = backup_containers + os.sep
+            for file_path in shortcut_files:
+                backup_path = backup_prefix + file_path[prefix_len:]
+                try:
+                    # The file is being deleted anyway, so moving it into the backup (same volume)
+                    # is a single rename with no data copied
+                    os.replace(file_path, backup_path)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    _fast_copy(file_path, backup_path)
+                    os.unlink(file_path)
+        else:
+            unlink = os.unlink
+            for file_path in shortcut_files:
+                unlink(file_path)
 
-        results.append({
+        return {
             "accountName": target_account,
-            "characterId": str(target_character_id),
-            "copied": copied_details,
-            "missing": missing_details,
-            "backupDirectory": backup_dir if backed_up_items else None,
-            "backedUpItems": backed_up_items
-        })
+            "characterId": target_character_id,
+            "status": "success",
+            "message": f"Deleted {len(shortcut_files)} shortcutbar files" +
+                      (f" with backup in {os.path.basename(backup_dir)}" if backup_dir else "")
+        }, None
 
-    if not results and errors:
-        return jsonify({
+    except Exception as e:
+        logger.exception("Error deleting shortcutbar settings for %s/%s", target_account, target_character_id)
+        error_msg = f"Error deleting shortcutbar settings for {target_account}/{target_character_id}: {str(e)}"
+        return {
+            "accountName": target_account,
+            "characterId": target_character_id,
             "status": "error",
-            "message": "Preference copy failed for all targets",
-            "errors": errors,
-            "invalidItems": invalid_items
-        }), 500
-
-    status = "success" if not errors else "partial_success"
-    message = f"Copied preferences to {len(results)} character(s)."
-    if errors:
-        message += " Some items encountered issues."
-
-    return jsonify({
-        "status": status,
-        "message": message,
-        "results": results,
-        "errors": errors,
-        "invalidItems": invalid_items
-    }), 200
+            "message": f"Error: {str(e)}"
+        }, error_msg
 
 
 @app.route('/delete_shortcutbar_settings', methods=['POST'])
 def delete_shortcutbar_settings():
-    """Delete shortcutbar settings for selected characters."""
-    if platform.system() != 'Windows':
+    """Delete shortcutbar settings for selected characters.
+
+    A target listed more than once (same account, case-insensitively, and character ID) is
+    processed once; the repeats are logged and get no entry in ``results``.
+    """
+    if not _IS_WINDOWS:
         logger.warning("Shortcutbar deletion requested on unsupported platform")
-        return jsonify({
-            "status": "unsupported",
-            "message": "Shortcutbar deletion is only supported on Windows"
-        }), 200
+        return _unsupported_response("shortcutbar_delete")
 
-    data = request.json or {}
+    data = _request_json() or {}
 
     base_path = (data.get('prefsBasePath') or '').strip()
     targets_info = data.get('targets') or []
     create_backup = bool(data.get('createBackup'))
 
     if not base_path:
-        return jsonify({
+        return _json_response({
             "status": "error",
             "message": "Preference base path is required"
-        }), 400
+        }, 400)
 
     if not os.path.isdir(base_path):
-        return jsonify({
+        return _json_response({
             "status": "error",
             "message": f"Preference base path does not exist: {base_path}"
-        }), 400
+        }, 400)
 
     if not isinstance(targets_info, list) or len(targets_info) == 0:
-        return jsonify({
+        return _json_response({
             "status": "error",
             "message": "At least one character must be selected"
-        }), 400
+        }, 400)
 
     logger.info(
         "Deleting shortcutbar settings for %d target(s)",
         len(targets_info)
     )
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    results = []
+    backup_name = f"Backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}" if create_backup else None
     errors = []
+    target_jobs = []  # (account name, character id, target directory)
+    queued_targets = set()
 
     for target in targets_info:
         target_account = (target.get('accountName') or '').strip()
         target_character_id = target.get('characterId')
 
-        if not target_account or target_character_id is None or target_character_id == '':
+        if not target_account or target_character_id in (None, ''):
             error_msg = "Target account and character must be provided"
             errors.append(error_msg)
             logger.error(error_msg)
             continue
 
+        target_identifier = (target_account.lower(), str(target_character_id))
+        if target_identifier in queued_targets:
+            # Deleting from the same folder in two workers would race
+            logger.info("Skipping duplicate target %s/%s", target_account, target_character_id)
+            continue
+        queued_targets.add(target_identifier)
+
         target_dir = _get_character_prefs_path(base_path, target_account, target_character_id)
         if not target_dir:
             error_msg = f"Unable to determine target directory for {target_account}/{target_character_id}"
@@ -798,83 +1501,74 @@ def delete_shortcutbar_settings():
             logger.error(error_msg)
             continue
 
-        if not os.path.isdir(target_dir):
-            error_msg = f"Target character preferences not found at {target_dir}"
-            errors.append(error_msg)
-            logger.error(error_msg)
-            continue
-
-        # Setup backup if requested
-        backup_dir = None
-        if create_backup:
-            backup_root = os.path.join(
-                target_dir,
-                f"Backup_{timestamp}"
-            )
-            os.makedirs(backup_root, exist_ok=True)
-            backup_dir = backup_root
-
-        try:
-            # Find all shortcutbar files
-            shortcut_path_pattern = os.path.join(target_dir, "Containers", "ShortcutBar*.xml")
-            shortcut_files = glob(shortcut_path_pattern)
-            
-            if not shortcut_files:
-                logger.info(f"No shortcutbar files found for {target_account}/{target_character_id}")
-                results.append({
-                    "accountName": target_account,
-                    "characterId": target_character_id,
-                    "status": "success",
-                    "message": "No shortcutbar files found"
-                })
-                continue
-                
-            for file_path in shortcut_files:
-                # Backup file if requested
-                if backup_dir:
-                    rel_path = os.path.relpath(file_path, target_dir)
-                    backup_path = os.path.join(backup_dir, rel_path)
-                    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-                    shutil.copy2(file_path, backup_path)
-                    
-                # Delete the file
-                os.remove(file_path)
-                
-            results.append({
-                "accountName": target_account,
-                "characterId": target_character_id,
-                "status": "success",
-                "message": f"Deleted {len(shortcut_files)} shortcutbar files" + 
-                          (f" with backup in {os.path.basename(backup_dir)}" if backup_dir else "")
-            })
-            
-        except Exception as e:
-            error_msg = f"Error deleting shortcutbar settings for {target_account}/{target_character_id}: {str(e)}"
-            errors.append(error_msg)
-            logger.exception(error_msg)
-            results.append({
-                "accountName": target_account,
-                "characterId": target_character_id,
-                "status": "error",
-                "message": f"Error: {str(e)}"
-            })
-
-    status = "success"
-    message = f"Successfully deleted shortcutbar settings for {len(results)} characters"
-    
-    if len(errors) > 0:
-        status = "partial_success" if len(results) > 0 else "error"
-        message = f"Encountered {len(errors)} errors while deleting shortcutbar settings"
-
-    return jsonify({
-        "status": status,
-        "message": message,
-        "results": results,
-        "errors": errors
-    })
-
+        target_jobs.append((target_account, target_character_id, target_dir))
+
+    def generate():
+        # Stream results in the order the targets were sent, each as soon as it and every
+        # earlier target have finished; status and message depend on the totals, so they
+        # close the object.
+        result_count = 0
+        yield b'{"results":['
+        if target_jobs:
+            # Each target is its own folder, so the (I/O-bound) scans and deletes can overlap
+            with ThreadPoolExecutor(max_workers=min(8, len(target_jobs))) as executor:
+                futures = [
+                    (
+                        target_account,
+                        target_character_id,
+                        executor.submit(
+                            _delete_shortcutbar_target,
+                            target_account,
+                            target_character_id,
+                            target_dir,
+                            backup_name
+                        )
+                    )
+                    for target_account, target_character_id, target_dir in target_jobs
+                ]
+                for target_account, target_character_id, future in futures:
+                    try:
+                        result, error_msg = future.result()
+                    except Exception as e:
+                        # The response is already streaming, so report the failure in the body
+                        logger.exception(
+                            "Error deleting shortcutbar settings for %s/%s", target_account, target_character_id
+                        )
+                        error_msg = f"Error deleting shortcutbar settings for {target_account}/{target_character_id}: {str(e)}"
+                        result = None
+                    if result is not None:
+                        yield (b',' if result_count else b'') + _dumps_json(result)
+                        result_count += 1
+                    if error_msg:
+                        errors.append(error_msg)
+
+        status = "success"
+        message = f"Successfully deleted shortcutbar settings for {result_count} characters"
+
+        if len(errors) > 0:
+            status = "partial_success" if result_count > 0 else "error"
+            message = f"Encountered {len(errors)} errors while deleting shortcutbar settings"
+
+        yield (b'],"errors":' + _dumps_json(errors) + b',"status":' + _dumps_json(status)
+               + b',"message":' + _dumps_json(message) + b'}')
+
+    return app.response_class(generate(), mimetype='application/json')
 
 if __name__ == '__main__':
-    # Run the Flask app on all interfaces so it's reachable externally.
-    # Set debug=False for production and secure your app appropriately.
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Run the app on all interfaces so it's reachable externally.
+    # Debug mode is opt-in via AO_DEBUG=1 and always uses the Flask development server.
+    debug = os.environ.get('AO_DEBUG') == '1'
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+
+    if serve is not None and not debug:
+        # waitress handles requests on a thread pool, so a long preference copy or launch
+        # does not hold up window checks and focus requests.
+        logger.info("Serving with waitress on port 5000")
+        serve(app, host='0.0.0.0', port=5000, threads=16)
+    else:
+        # threaded=True lets a slow request overlap with others; the reloader stays off so no
+        # second interpreter (with pywin32 loaded) is forked.
+        app.run(host='0.0.0.0', port=5000, debug=debug, use_reloader=False, threaded=True)
@@ -486,6 +486,37 @@ function getSourcePayload() {
     };
 }
 
+async function readServerSentEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventName = 'message';
+            const dataLines = [];
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    eventName = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    dataLines.push(line.slice(5).trim());
+                }
+            });
+            if (dataLines.length) {
+                onEvent(eventName, JSON.parse(dataLines.join('\n')));
+            }
+        }
+    }
+}
+
 async function handleCopyPreferences(createBackup) {
     const basePath = prefsBasePathInput.value.trim();
     if (!basePath) {
@@ -529,7 +560,7 @@ async function handleCopyPreferences(createBackup) {
     showPrefsMessage('Copying preferences…', 'info');
 
     try {
-        const response = await fetch('/copy_preferences', {
+        const response = await fetch('/copy_preferences_stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -537,10 +568,35 @@ async function handleCopyPreferences(createBackup) {
             body: JSON.stringify(payload)
         });
 
-        const result = await response.json();
+        let result;
+        let ok = response.ok;
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.startsWith('text/event-stream')) {
+            // Progress arrives per target; the final "done" event carries the usual response body
+            let total = 0;
+            let finished = 0;
+            await readServerSentEvents(response, (eventName, data) => {
+                if (eventName === 'started') {
+                    total = data.targets.length;
+                    showPrefsMessage(`Copying preferences… 0/${total}`, 'info');
+                } else if (eventName === 'target') {
+                    finished += 1;
+                    showPrefsMessage(`Copying preferences… ${finished}/${total}`, 'info');
+                } else if (eventName === 'done') {
+                    result = data;
+                    ok = data.httpStatus < 400;
+                }
+            });
+            if (!result) {
+                throw new Error('Preference copy stream ended without a result');
+            }
+        } else {
+            // Validation errors and unsupported platforms are answered with plain JSON
+            result = await response.json();
+        }
         console.log('Preference copy result', result);
 
-        if (!response.ok || result.status === 'error') {
+        if (!ok || result.status === 'error') {
             const message = result.message || 'Copy failed.';
             showPrefsMessage(message, 'error');
             return;